@@ -1,51 +1,158 @@
 import os
-import requests
-from datetime import datetime, timedelta
+import json
+import hashlib
+import tempfile
+from datetime import datetime, timedelta, timezone
 import pandas as pd
 import streamlit as st
+from sling import DEFAULT_RATE_LIMIT, SlingUnavailable, get_session, fetch_user_directory, get_organizations, get_rate_limiter, run_per_org
+
+# Time after a day's last shift end before its timesheets are treated as final
+SETTLE_GRACE = timedelta(hours=6)
+# Seconds a stored fetch of a day that has not settled yet is reused; the warm-up
+# process refreshes the latest days on its schedule
+OPEN_DAY_TTL = 6 * 60 * 60
+
+def standard_periods(today=None):
+    """Standard report periods ending with the latest closed day (yesterday)"""
+    today = today or datetime.now().date()
+    yesterday = today - timedelta(days=1)
+    return {
+        'Yesterday': (yesterday, yesterday),
+        'Week to Date': (yesterday - timedelta(days=yesterday.weekday()), yesterday),
+        'Month to Date': (yesterday.replace(day=1), yesterday)
+    }
 
 class AttendanceAnalyzer:
-    def __init__(self):
-        self.api_base = st.secrets["SLING_API_BASE"]
-        self.headers = {'Authorization': st.secrets["SLING_API_KEY"]}
+    def __init__(self, api_base=None, api_key=None, org_id=None, rate_limit=None):
+        # Credentials not passed in come from the configured organization (the first
+        # one without an org_id); standalone processes pass their own
+        org = {}
+        if org_id is None:
+            org = get_organizations()[0]
+        elif api_key is None:
+            org = next((org for org in get_organizations() if org['id'] == str(org_id)), None)
+            if org is None:
+                raise ValueError(f"Sling organization {org_id} is not configured")
+        self.api_base = api_base or st.secrets["SLING_API_BASE"]
+        self.headers = {'Authorization': api_key or org['api_key']}
+        self.org_id = str(org_id or org['id'])
+        # Maximum requests per second to this organization
+        self.rate_limit = rate_limit or org.get('rate_limit') or DEFAULT_RATE_LIMIT
         self.late_threshold = 15
         self.early_threshold = 15  # Consider early if leaving 15 minutes before shift end
         self.break_threshold = 60  # Maximum allowed break duration in minutes
         self.start_date = datetime(2025, 1, 1)
         self.end_date = datetime(2025, 1, 26)
         self.output_dir = 'attendance_reports'
+        self.cache_dir = os.path.join(self.output_dir, 'cache', str(self.org_id))
+        self.use_cache = True  # Reuse stored timesheets for settled days
+        self.refresh_timesheets = False  # Refetch every day from Sling, replacing stored ones
+        self.raise_on_fetch_error = False  # Raise SlingUnavailable instead of returning empty data
+        self.open_day_ttl = OPEN_DAY_TTL  # Seconds stored timesheets of a day still open are reused
+        self.fetched_timesheets = {}  # Timesheets used by this analyzer, by date, so a run sees each day once
+        self.recomputed_dates = []  # Days re-analyzed by the last run
+        self.day_hashes = []  # Content hash of every day in the last run
+        self.last_range_hash = None  # range_hash of the data the last summary was built from
         os.makedirs(self.output_dir, exist_ok=True)
 
     def fetch_user_data(self) -> dict:
         """Fetch all users from Sling API"""
-        url = f"{self.api_base}/{st.secrets['SLING_ORG_ID']}/users"
+        url = f"{self.api_base}/{self.org_id}/users"
         try:
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                data = response.json()
-                user_map = {
-                    str(user['id']): {
-                        'email': user.get('email'),
-                        'name': f"{user.get('firstname', '')} {user.get('lastname', '')}".strip()
-                    }
-                    for user in data
-                    if user.get('email')
+            data = fetch_user_directory(url, self.org_id, self.headers['Authorization'], self.rate_limit)
+            user_map = {
+                str(user['id']): {
+                    'email': user.get('email'),
+                    'name': f"{user.get('firstname', '')} {user.get('lastname', '')}".strip()
                 }
-                return user_map
-            return {}
+                for user in data
+                if user.get('email')
+            }
+            return user_map
         except Exception as e:
+            if self.raise_on_fetch_error:
+                raise SlingUnavailable(f"Error fetching user data: {e}") from e
             print(f"Error fetching user data: {e}")
             return {}
 
-    def fetch_timesheet_data(self, date: datetime) -> list:
-        """Fetch timesheet data from Sling API"""
+    def _settled_at(self, date, timesheet_data: list) -> datetime:
+        """When a day's timesheets can be treated as final (UTC)
+        
+        Night shifts end the next UTC day, so a day only settles SETTLE_GRACE after
+        the later of its last shift end and the end of the following UTC day.
+        """
+        settled_at = datetime(date.year, date.month, date.day, tzinfo=timezone.utc) + timedelta(days=2)
+        for entry in timesheet_data:
+            try:
+                shift_end = datetime.fromisoformat(entry['dtend'].replace('Z', '+00:00'))
+            except (KeyError, TypeError, AttributeError, ValueError):
+                continue
+            if shift_end.tzinfo is None:
+                shift_end = shift_end.replace(tzinfo=timezone.utc)
+            settled_at = max(settled_at, shift_end)
+        return settled_at + SETTLE_GRACE
+
+    def _timesheet_file(self, date) -> str:
+        return os.path.join(self.cache_dir, 'timesheets', f"{date.strftime('%Y-%m-%d')}.json")
+
+    def load_cached_timesheets(self, date):
+        """Stored timesheets of a day, or None when the day has to be fetched
+        
+        Settled days are served for good; days still open only while their fetch
+        is younger than open_day_ttl.
+        """
+        if not self.use_cache:
+            return None
+        cached = self._read_json(self._timesheet_file(date))
+        if not isinstance(cached, dict) or 'data' not in cached:
+            return None
+        if cached.get('settled', True):
+            return cached['data']
+        try:
+            age = datetime.now(timezone.utc) - datetime.fromisoformat(cached['fetched_at'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return cached['data'] if age < timedelta(seconds=self.open_day_ttl) else None
+
+    def store_timesheets(self, date, timesheet_data: list, fetched_at: datetime) -> None:
+        """Store a fetched day under cache_dir, marking whether it has settled
+        
+        Days that have not started yet are not stored, there is nothing to reuse.
+        """
+        if not self.use_cache or date.strftime('%Y-%m-%d') > fetched_at.strftime('%Y-%m-%d'):
+            return
+        self._write_json(self._timesheet_file(date), {
+            'fetched_at': fetched_at.isoformat(timespec='seconds'),
+            'settled': fetched_at >= self._settled_at(date, timesheet_data),
+            'data': timesheet_data
+        })
+
+    def fetch_timesheet_data(self, date: datetime, refresh: bool = False) -> list:
+        """Fetch timesheet data from Sling API
+        
+        A day is fetched at most once per analyzer (see fetched_timesheets), so a
+        report reuses the timesheets its range_hash was computed from. Fetched days
+        are stored under cache_dir and served from there (see load_cached_timesheets)
+        unless refresh or refresh_timesheets is set; refresh also bypasses
+        fetched_timesheets, the warm-up process uses it for the latest days.
+        """
         date_str = date.strftime('%Y-%m-%d')
         date_range = f"{date_str}/{date_str}"
         nonce = int(datetime.now().timestamp() * 1000)
         
-        url = f"{self.api_base}/{st.secrets['SLING_ORG_ID']}/reports/timesheets"
+        if not refresh:
+            if date_str in self.fetched_timesheets:
+                return self.fetched_timesheets[date_str]
+            cached = None if self.refresh_timesheets else self.load_cached_timesheets(date)
+            if cached is not None:
+                self.fetched_timesheets[date_str] = cached
+                return cached
+        
+        url = f"{self.api_base}/{self.org_id}/reports/timesheets"
+        get_rate_limiter(self.org_id, self.rate_limit).wait()
         try:
-            response = requests.get(
+            response = get_session().get(
                 url,
                 headers=self.headers,
                 params={
@@ -53,12 +160,248 @@ class AttendanceAnalyzer:
                     'nonce': nonce
                 }
             )
-            return response.json() if response.status_code == 200 else []
-        except Exception:
+            if response.status_code != 200:
+                raise SlingUnavailable(f"Timesheets for {date_str} returned HTTP {response.status_code}")
+            data = response.json()
+        except SlingUnavailable:
+            if self.raise_on_fetch_error:
+                raise
+            return []
+        except Exception as e:
+            if self.raise_on_fetch_error:
+                raise SlingUnavailable(f"Error fetching timesheets for {date_str}: {e}") from e
             return []
+        
+        self.store_timesheets(date, data, datetime.now(timezone.utc))
+        self.fetched_timesheets[date_str] = data
+        return data
+
+    def _write_json(self, path: str, data) -> None:
+        """Write JSON atomically so readers never see a partial file
+        
+        Each writer gets its own temporary file, so concurrent sessions, threads and
+        the warm-up process can write the same path safely.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read_json(self, path: str):
+        """Read a cache file, treating a missing or unreadable file as a cache miss"""
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _summary_file(self, start_date, end_date) -> str:
+        return os.path.join(
+            self.cache_dir, 'summaries',
+            f"{start_date.strftime('%Y-%m-%d')}_{end_date.strftime('%Y-%m-%d')}.json"
+        )
+
+    def save_summary(self, summary_df: pd.DataFrame, start_date, end_date, duration: float) -> None:
+        """Store a precomputed summary so the dashboard can serve it without fetching"""
+        self._write_json(self._summary_file(start_date, end_date), {
+            'start_date': start_date.strftime('%Y-%m-%d'),
+            'end_date': end_date.strftime('%Y-%m-%d'),
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'duration': round(duration, 3),
+            'range_hash': self.last_range_hash,
+            'records': summary_df.to_dict('records')
+        })
+
+    def load_summary(self, start_date, end_date):
+        """Load a precomputed summary for the exact date range and when it was generated
+        
+        The summary is only served while the users and every day's timesheets still
+        hash the same as when it was built.
+        """
+        stored = self._read_json(self._summary_file(start_date, end_date))
+        if stored is None or stored.get('range_hash') != self.range_hash(start_date, end_date):
+            return None, None
+        return pd.DataFrame(stored['records']), stored['generated_at']
+
+    def _day_hash(self, date, timesheet_data: list) -> str:
+        """Hash a day's normalized payload together with the settings it is analyzed with"""
+        normalized = json.dumps({
+            'date': date.strftime('%Y-%m-%d'),
+            'thresholds': [self.late_threshold, self.early_threshold, self.break_threshold],
+            'entries': sorted(json.dumps(entry, sort_keys=True) for entry in timesheet_data)
+        }, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def _combine_hashes(self, user_map: dict, day_hashes: list) -> str:
+        digest = hashlib.sha256(json.dumps(user_map, sort_keys=True).encode())
+        for day_hash in day_hashes:
+            digest.update(day_hash.encode())
+        return digest.hexdigest()
+
+    def range_hash(self, start_date=None, end_date=None) -> str:
+        """Hash of the user directory and every day's timesheets in the date range"""
+        day_hashes = []
+        current_date = start_date or self.start_date
+        while current_date <= (end_date or self.end_date):
+            day_hashes.append(self._day_hash(current_date, self.fetch_timesheet_data(current_date)))
+            current_date += timedelta(days=1)
+        return self._combine_hashes(self.fetch_user_data(), day_hashes)
+
+    def analyze_day(self, date, timesheet_data: list) -> dict:
+        """Analyze one day's timesheets into per-user results for every scheduled user"""
+        day_results = {}
+        
+        for entry in timesheet_data:
+            try:
+                user_info = entry.get('user', {})
+                user_id = str(user_info.get('id'))
+                
+                # Count scheduled shift
+                result = day_results.setdefault(user_id, {
+                    'present': False,
+                    'late': False,
+                    'early_out': False,
+                    'extended_breaks': []  # Dates and durations of extended breaks
+                })
+
+                shift_start = datetime.fromisoformat(entry['dtstart'].replace('Z', '+00:00'))
+                shift_end = datetime.fromisoformat(entry['dtend'].replace('Z', '+00:00'))
+                entries = entry.get('timesheetEntries', [])
+                
+                # Sort entries by timestamp for proper break calculation
+                sorted_entries = sorted(entries, key=lambda x: x['timestamp'])
+                
+                # Look for clock-in, clock-out, and breaks
+                clock_in = None
+                clock_out = None
+                current_break_start = None
+                breaks = []  # To store all break periods
+                
+                for record in sorted_entries:
+                    entry_type = record.get('type')
+                    timestamp = datetime.fromisoformat(record['timestamp'].replace('Z', '+00:00'))
+
+                    if entry_type == 'clock_in':
+                        if not clock_in:
+                            clock_in = timestamp
+                        if current_break_start:
+                            # End of a break period
+                            breaks.append((current_break_start, timestamp, timestamp - current_break_start))
+                            current_break_start = None
+                            
+                    elif entry_type in ['clock_out', 'auto_clock_out']:
+                        clock_out = timestamp
+                        if not current_break_start:
+                            current_break_start = timestamp
+                    
+                    elif entry_type == 'break_start':
+                        current_break_start = timestamp
+                    elif entry_type == 'break_end' and current_break_start:
+                        breaks.append((current_break_start, timestamp, timestamp - current_break_start))
+                        current_break_start = None
+                
+                # Process extended breaks
+                for break_start, break_end, duration in breaks:
+                    break_minutes = duration.total_seconds() / 60
+                    if break_minutes > self.break_threshold:
+                        result['extended_breaks'].append({
+                            'date': date.strftime('%Y-%m-%d'),
+                            'start_time': break_start.strftime('%H:%M'),
+                            'end_time': break_end.strftime('%H:%M'),
+                            'duration': round(break_minutes)
+                        })
+                
+                if clock_in:
+                    # Mark as present
+                    result['present'] = True
+                    
+                    # Check for late arrival
+                    minutes_late = (clock_in - shift_start).total_seconds() / 60
+                    if minutes_late > self.late_threshold:
+                        result['late'] = True
+                
+                # Check for early clock-out
+                if clock_out:
+                    minutes_early = (shift_end - clock_out).total_seconds() / 60
+                    if minutes_early > self.early_threshold:
+                        result['early_out'] = True
+
+            except Exception as e:
+                print(f"Error processing entry: {str(e)}")
+                continue
+        
+        return day_results
+
+    def get_day_results(self, date) -> dict:
+        """Per-user results for one day, reused by content hash when the timesheets are unchanged"""
+        timesheet_data = self.fetch_timesheet_data(date)
+        day_hash = self._day_hash(date, timesheet_data)
+        self.day_hashes.append(day_hash)
+        day_file = os.path.join(self.cache_dir, 'days', f"{day_hash}.json")
+        if self.use_cache:
+            day_results = self._read_json(day_file)
+            if day_results is not None:
+                return day_results
+        
+        day_results = self.analyze_day(date, timesheet_data)
+        self.recomputed_dates.append(date.strftime('%Y-%m-%d'))
+        if self.use_cache:
+            self._write_json(day_file, day_results)
+        return day_results
+
+    def analyze_events(self) -> pd.DataFrame:
+        """List individual attendance events (absences, late arrivals, early clock-outs, extended breaks)"""
+        self.recomputed_dates = []
+        self.day_hashes = []
+        user_map = self.fetch_user_data()
+        
+        event_records = []
+        current_date = self.start_date
+        while current_date <= self.end_date:
+            date_str = current_date.strftime('%Y-%m-%d')
+            for user_id, result in self.get_day_results(current_date).items():
+                if user_id not in user_map:
+                    continue
+                
+                events = []
+                if not result['present']:
+                    events.append(('Absent', ''))
+                if result['late']:
+                    events.append(('Late Arrival', ''))
+                if result['early_out']:
+                    events.append(('Early Clock-out', ''))
+                for break_detail in result['extended_breaks']:
+                    events.append((
+                        'Extended Break',
+                        f"{break_detail['start_time']}-{break_detail['end_time']}, {break_detail['duration']} mins"
+                    ))
+                
+                for event, details in events:
+                    event_records.append({
+                        'Date': date_str,
+                        'User ID': user_id,
+                        'Full Name': user_map[user_id]['name'],
+                        'Event': event,
+                        'Details': details
+                    })
+            current_date += timedelta(days=1)
+        
+        return pd.DataFrame(event_records, columns=['Date', 'User ID', 'Full Name', 'Event', 'Details'])
 
     def analyze_attendance(self) -> pd.DataFrame:
-        """Analyze attendance focusing on shifts and late arrivals"""
+        """Analyze attendance focusing on shifts and late arrivals
+        
+        Each day's results are stored by the hash of its timesheets, so days whose
+        timesheets did not change are reused; recomputed_dates lists the others.
+        """
+        self.recomputed_dates = []
+        self.day_hashes = []
         user_map = self.fetch_user_data()
         if not user_map:
             print("No users found!")
@@ -84,117 +427,29 @@ class AttendanceAnalyzer:
         # Process each date
         current_date = self.start_date
         while current_date <= self.end_date:
-            timesheet_data = self.fetch_timesheet_data(current_date)
-            
-            # Track scheduled shifts and clock-ins for each user for this day
-            daily_scheduled = set()  # Track users who had shifts this day
-            daily_present = set()    # Track users who clocked in this day
-            daily_late = set()       # Track users who were late this day
-            daily_early_out = set()  # Track users who left early this day
-            
-            for entry in timesheet_data:
-                try:
-                    user_info = entry.get('user', {})
-                    user_id = str(user_info.get('id'))
-                    
-                    if user_id not in user_map:
-                        continue
-
-                    # Count scheduled shift
-                    if user_id not in daily_scheduled:
-                        daily_scheduled.add(user_id)
-                        attendance_records[user_id]['total_scheduled_shifts'] += 1
-
-                    shift_start = datetime.fromisoformat(entry['dtstart'].replace('Z', '+00:00'))
-                    shift_end = datetime.fromisoformat(entry['dtend'].replace('Z', '+00:00'))
-                    entries = entry.get('timesheetEntries', [])
-                    
-                    # Sort entries by timestamp for proper break calculation
-                    sorted_entries = sorted(entries, key=lambda x: x['timestamp'])
-                    
-                    # Look for clock-in, clock-out, and breaks
-                    clock_in = None
-                    clock_out = None
-                    current_break_start = None
-                    breaks = []  # To store all break periods
-                    total_break = timedelta(minutes=0)
-                    
-                    for record in sorted_entries:
-                        entry_type = record.get('type')
-                        timestamp = datetime.fromisoformat(record['timestamp'].replace('Z', '+00:00'))
-
-                        if entry_type == 'clock_in':
-                            if not clock_in:
-                                clock_in = timestamp
-                            if current_break_start:
-                                # End of a break period
-                                break_duration = timestamp - current_break_start
-                                breaks.append((current_break_start, timestamp, break_duration))
-                                total_break += break_duration
-                                current_break_start = None
-                                
-                        elif entry_type in ['clock_out', 'auto_clock_out']:
-                            clock_out = timestamp
-                            if not current_break_start:
-                                current_break_start = timestamp
-                        
-                        elif entry_type == 'break_start':
-                            current_break_start = timestamp
-                        elif entry_type == 'break_end' and current_break_start:
-                            break_duration = timestamp - current_break_start
-                            breaks.append((current_break_start, timestamp, break_duration))
-                            total_break += break_duration
-                            current_break_start = None
-                    
-                    # Process extended breaks
-                    for break_start, break_end, duration in breaks:
-                        break_minutes = duration.total_seconds() / 60
-                        if break_minutes > self.break_threshold:
-                            attendance_records[user_id]['extended_breaks'] += 1
-                            attendance_records[user_id]['extended_break_details'].append({
-                                'date': current_date.strftime('%Y-%m-%d'),
-                                'start_time': break_start.strftime('%H:%M'),
-                                'end_time': break_end.strftime('%H:%M'),
-                                'duration': round(break_minutes)
-                            })
-                    
-                    if clock_in:
-                        # Mark as present
-                        if user_id not in daily_present:
-                            daily_present.add(user_id)
-                        
-                        # Check for late arrival
-                        if user_id not in daily_late:  # Only check if not already marked late today
-                            minutes_late = (clock_in - shift_start).total_seconds() / 60
-                            if minutes_late > self.late_threshold:
-                                daily_late.add(user_id)
-                                attendance_records[user_id]['late_arrival_dates'].append(current_date.strftime('%Y-%m-%d'))
-                    
-                    # Check for early clock-out
-                    if clock_out and user_id not in daily_early_out:
-                        minutes_early = (shift_end - clock_out).total_seconds() / 60
-                        if minutes_early > self.early_threshold:
-                            daily_early_out.add(user_id)
-                            attendance_records[user_id]['early_clock_out_dates'].append(current_date.strftime('%Y-%m-%d'))
-
-                except Exception as e:
-                    print(f"Error processing entry: {str(e)}")
-                    continue
+            date_str = current_date.strftime('%Y-%m-%d')
+            day_results = self.get_day_results(current_date)
             
             # Update attendance records for this day
-            for user_id in daily_present:
-                attendance_records[user_id]['days_present'] += 1
-            
-            # Record absences for scheduled but not present
-            for user_id in daily_scheduled:
-                if user_id not in daily_present:
-                    attendance_records[user_id]['absent_dates'].append(current_date.strftime('%Y-%m-%d'))
-            
-            for user_id in daily_late:
-                attendance_records[user_id]['late_arrivals'] += 1
+            for user_id, result in day_results.items():
+                if user_id not in user_map:
+                    continue
                 
-            for user_id in daily_early_out:
-                attendance_records[user_id]['early_clock_outs'] += 1
+                record = attendance_records[user_id]
+                record['total_scheduled_shifts'] += 1
+                if result['present']:
+                    record['days_present'] += 1
+                else:
+                    # Record absences for scheduled but not present
+                    record['absent_dates'].append(date_str)
+                if result['late']:
+                    record['late_arrivals'] += 1
+                    record['late_arrival_dates'].append(date_str)
+                if result['early_out']:
+                    record['early_clock_outs'] += 1
+                    record['early_clock_out_dates'].append(date_str)
+                record['extended_breaks'] += len(result['extended_breaks'])
+                record['extended_break_details'].extend(result['extended_breaks'])
 
             current_date += timedelta(days=1)
 
@@ -224,13 +479,63 @@ class AttendanceAnalyzer:
                     
                 })
 
+        self.last_range_hash = self._combine_hashes(user_map, self.day_hashes)
         return pd.DataFrame(summary_records)
 
+def analyze_organizations(organizations, start_date, end_date, refresh=False):
+    """Analyze several organizations concurrently over the shared pool
+    
+    Returns the combined summary with an Organization column and a per-organization
+    breakdown of the totals, with the days each organization recomputed or when its
+    precomputed summary was generated.
+    """
+    def analyze(org):
+        analyzer = AttendanceAnalyzer(api_key=org['api_key'], org_id=org['id'], rate_limit=org['rate_limit'])
+        analyzer.refresh_timesheets = refresh
+        summary_df, generated_at = (None, None) if refresh else analyzer.load_summary(start_date, end_date)
+        if summary_df is None:
+            analyzer.start_date = start_date
+            analyzer.end_date = end_date
+            summary_df = analyzer.analyze_attendance()
+        return summary_df, analyzer.recomputed_dates, generated_at
+
+    results = run_per_org(analyze, organizations)
+    total_days = (end_date - start_date).days + 1
+    
+    frames = []
+    breakdown_records = []
+    for org, (summary_df, recomputed, generated_at) in zip(organizations, results):
+        if summary_df.empty:
+            continue
+        frames.append(summary_df.assign(Organization=org['name'])[['Organization', *summary_df.columns]])
+        breakdown_records.append({
+            'Organization': org['name'],
+            'Employees': len(summary_df),
+            **summary_df[[
+                'Total Scheduled Shifts', 'Days Present', 'Days Absent',
+                'Late Arrivals', 'Early Clock-outs', 'Extended Breaks'
+            ]].sum().to_dict(),
+            'Recomputed Days': 'None' if generated_at else recomputed_caption(recomputed, total_days),
+            'Precomputed At': generated_at or 'None'
+        })
+    
+    if not frames:
+        return pd.DataFrame(), pd.DataFrame()
+    return pd.concat(frames, ignore_index=True), pd.DataFrame(breakdown_records)
+
+def recomputed_caption(recomputed_dates, total_days) -> str:
+    """Describe which days of a report were recomputed, listing them unless it was all of them"""
+    return (
+        f"{len(recomputed_dates)} of {total_days} days"
+        + (f": {', '.join(recomputed_dates)}" if recomputed_dates and len(recomputed_dates) < total_days else "")
+    )
+
 def main():
     try:
         analyzer = AttendanceAnalyzer()
         print("Analyzing attendance data...")
         summary_df = analyzer.analyze_attendance()
+        print(f"Recomputed days: {', '.join(analyzer.recomputed_dates) or 'None'}")
         
         if summary_df.empty:
             print("No attendance data was generated.")
@@ -1,32 +1,101 @@
+import time
+_script_start = time.perf_counter()
+
+import importlib
+import sys
 import streamlit as st
 
+# Heavy dependencies of the pages, imported one by one before the page itself so
+# each shows up in the timings on its own (the server has already imported streamlit)
+PAGE_DEPENDENCIES = ["numpy", "pandas", "requests", "sling"]
+
 st.set_page_config(
     page_title="Homeeasy Sales Dashboard",
     layout="wide"
 )
 
-from Reporting import AttendanceAnalyzer
-import shifts
-import pandas as pd
+@st.cache_resource(show_spinner=False)
+def get_startup_timings():
+    """Process-wide startup timings, filled in by the first run after a restart"""
+    return {'imports': {}, 'first_render': None}
+
+def timed_import(name):
+    """Import a module if needed and record how long the import took"""
+    if name not in sys.modules:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        get_startup_timings()['imports'][name] = time.perf_counter() - start
+    return sys.modules[name]
+
+def load_module(name):
+    """Import a page module on first use, timing its heavy dependencies separately"""
+    for dependency in PAGE_DEPENDENCIES:
+        timed_import(dependency)
+    return timed_import(name)
+
+def show_startup_timings(timings):
+    """Show the startup timing report when the page is opened with ?profile=1"""
+    if not st.query_params.get("profile"):
+        return
+    with st.sidebar.expander("⏱️ Startup Timings"):
+        for name, seconds in timings['imports'].items():
+            st.text(f"import {name}: {seconds * 1000:.0f} ms")
+        if timings['first_render'] is not None:
+            st.text(f"first render: {timings['first_render'] * 1000:.0f} ms")
 
 def show_reporting():
     st.title("Attendance Reporting Dashboard")
     
-    analyzer = AttendanceAnalyzer()
+    reporting = load_module("Reporting")
+    all_organizations = load_module("sling").get_organizations()
+    organizations = all_organizations
+    if len(all_organizations) > 1:
+        org_names = st.multiselect(
+            "Organizations",
+            [org['name'] for org in all_organizations],
+            default=[org['name'] for org in all_organizations]
+        )
+        organizations = [org for org in all_organizations if org['name'] in org_names]
+    
+    org = (organizations or all_organizations)[0]
+    analyzer = reporting.AttendanceAnalyzer(api_key=org['api_key'], org_id=org['id'], rate_limit=org['rate_limit'])
+    
+    # Standard periods are precomputed by the warm-up process (warmup.py)
+    periods = reporting.standard_periods()
+    period = st.selectbox("Period", ["Custom", *periods])
+    default_start, default_end = periods.get(period, (analyzer.start_date, analyzer.end_date))
     
     col1, col2 = st.columns(2)
     with col1:
-        start_date = st.date_input("Start Date", analyzer.start_date)
+        start_date = st.date_input("Start Date", default_start)
     with col2:
-        end_date = st.date_input("End Date", analyzer.end_date)
+        end_date = st.date_input("End Date", default_end)
+    
+    # Stored timesheets only cover settled days, this also picks up later corrections
+    refresh = st.checkbox("Refetch all days from Sling")
     
     if st.button("Generate Report"):
         with st.spinner("Analyzing attendance data..."):
             analyzer.start_date = start_date
             analyzer.end_date = end_date
+            analyzer.refresh_timesheets = refresh
             
 
-            summary_df = analyzer.analyze_attendance()
+            if len(organizations) == 1:
+                summary_df, generated_at = (None, None) if refresh else analyzer.load_summary(start_date, end_date)
+                if summary_df is None:
+                    summary_df = analyzer.analyze_attendance()
+                    total_days = (end_date - start_date).days + 1
+                    st.caption(f"Recomputed {reporting.recomputed_caption(analyzer.recomputed_dates, total_days)}")
+                else:
+                    st.caption(f"Served from results precomputed at {generated_at}")
+            else:
+                # Organizations are fetched concurrently and combined with an Organization column;
+                # the breakdown shows per organization what was recomputed or precomputed
+                summary_df, breakdown_df = reporting.analyze_organizations(organizations, start_date, end_date, refresh)
+                if not breakdown_df.empty:
+                    st.write("#### Per-Organization Breakdown")
+                    st.dataframe(breakdown_df, use_container_width=True, hide_index=True)
             
             if not summary_df.empty:
                 st.success("Report generated successfully!")
@@ -58,12 +127,14 @@ def main():
     
     page = st.sidebar.selectbox(
         "Select Dashboard",
-        ["Shift Management", "Attendance Reporting"],
+        # Reporting first: it fetches nothing until a report is generated
+        ["Attendance Reporting", "Shift Management"],
         format_func=lambda x: f"📊 {x}" if x == "Attendance Reporting" else f"📅 {x}"
     )
     
+    # Pages are imported on selection so one page never pays for the other
     if page == "Shift Management":
-        shifts.main()
+        load_module("shifts").main()
     else:
         show_reporting()
     
@@ -85,6 +156,15 @@ def main():
         """,
         unsafe_allow_html=True
     )
+    
+    timings = get_startup_timings()
+    if timings['first_render'] is None:
+        timings['first_render'] = time.perf_counter() - _script_start
+        print("Startup timings: " + ", ".join(
+            [f"import {name} {seconds * 1000:.0f} ms" for name, seconds in timings['imports'].items()]
+            + [f"first render {timings['first_render'] * 1000:.0f} ms"]
+        ))
+    show_startup_timings(timings)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
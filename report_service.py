@@ -0,0 +1,227 @@
+"""Read-only attendance report service for payroll and BI tools.
+
+    python report_service.py --port 8502
+
+    GET /summary?start=2025-01-01&end=2025-01-26   per-employee summary
+    GET /events?start=2025-01-01&end=2025-01-26    one row per absence, late arrival,
+                                                   early clock-out or extended break
+
+Optional parameters: org (one organization id, default all), format (json or
+parquet), page and page_size; a request covers at most MAX_RANGE_DAYS days.
+Responses carry an ETag computed from the cached timesheets, so clients polling
+with If-None-Match get a 304 until the data changes. Settled days are served
+from the warm-up cache and stored fetches of days still open are reused for
+OPEN_DAY_TTL seconds, so polling does not add Sling traffic.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode, urlparse, parse_qs
+
+import pandas as pd
+
+from Reporting import AttendanceAnalyzer
+from sling import SlingUnavailable, get_process_organizations, run_per_org
+
+# Seconds timesheets of days still open are reused before refetching
+OPEN_DAY_TTL = 300
+# Longest date range one request may cover; each uncached day is one Sling call
+MAX_RANGE_DAYS = 92
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+# Rendered responses kept in memory, keyed by ETag
+RESPONSE_CACHE_SIZE = 64
+# Smaller bodies are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+_responses = OrderedDict()
+_responses_lock = threading.Lock()
+
+class ServiceAnalyzer(AttendanceAnalyzer):
+    """Analyzer for one request, reusing stored timesheets of days still open for OPEN_DAY_TTL seconds
+    
+    Every day and the user directory are read once per request, so the report is
+    built from the same data its ETag was computed from. Failed Sling fetches raise
+    SlingUnavailable, so they are never served as empty data.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.raise_on_fetch_error = True
+        self.open_day_ttl = OPEN_DAY_TTL
+        self._user_map = None
+
+    def fetch_user_data(self) -> dict:
+        if self._user_map is None:
+            self._user_map = super().fetch_user_data()
+        return self._user_map
+
+def build_report(kind, analyzers, organizations):
+    """Run the summary or events report for every organization and combine them"""
+    def run(org):
+        analyzer = analyzers[org['id']]
+        return analyzer.analyze_events() if kind == 'events' else analyzer.analyze_attendance()
+
+    frames = run_per_org(run, organizations)
+    if len(organizations) > 1:
+        frames = [
+            report_df.assign(Organization=org['name'])[['Organization', *report_df.columns]]
+            for org, report_df in zip(organizations, frames)
+            if not report_df.empty
+        ]
+    frames = [report_df for report_df in frames if not report_df.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def render_page(report_df, fmt, meta):
+    """Serialize one page of the report as JSON or Parquet"""
+    start = (meta['page'] - 1) * meta['page_size']
+    page_df = report_df.iloc[start:start + meta['page_size']]
+
+    if fmt == 'parquet':
+        buffer = io.BytesIO()
+        page_df.to_parquet(buffer, index=False)
+        return buffer.getvalue(), 'application/vnd.apache.parquet'
+
+    body = {**meta, 'total': len(report_df), 'records': page_df.to_dict('records')}
+    # numpy scalars from pandas are converted with .item()
+    return json.dumps(body, default=lambda value: value.item()).encode(), 'application/json'
+
+class ReportHandler(BaseHTTPRequestHandler):
+    server_version = "AttendanceReport/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        kind = url.path.strip('/')
+        if kind not in ('summary', 'events'):
+            return self._send_error(404, "Unknown report, use /summary or /events")
+
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            start_date = datetime.strptime(params['start'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(params['end'], '%Y-%m-%d').date()
+            page = int(params.get('page', 1))
+            page_size = min(int(params.get('page_size', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        except KeyError as e:
+            return self._send_error(400, f"Missing parameter {e}")
+        except ValueError as e:
+            return self._send_error(400, f"Invalid parameter: {e}")
+        fmt = params.get('format', 'json')
+        if end_date < start_date or page < 1 or page_size < 1 or fmt not in ('json', 'parquet'):
+            return self._send_error(400, "Invalid date range, page or format")
+        if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+            return self._send_error(400, f"Date range is limited to {MAX_RANGE_DAYS} days")
+
+        organizations = self.server.organizations
+        if 'org' in params:
+            organizations = [org for org in organizations if org['id'] == params['org']]
+            if not organizations:
+                return self._send_error(404, f"Unknown organization {params['org']}")
+
+        analyzers = {}
+        for org in organizations:
+            analyzer = ServiceAnalyzer(
+                api_base=self.server.api_base,
+                api_key=org['api_key'],
+                org_id=org['id'],
+                rate_limit=org['rate_limit']
+            )
+            analyzer.start_date = start_date
+            analyzer.end_date = end_date
+            analyzers[org['id']] = analyzer
+
+        # The ETag covers the request and the content of every day it depends on; the
+        # analyzers keep what they read, so the report below is built from the same data
+        try:
+            range_hashes = run_per_org(lambda org: analyzers[org['id']].range_hash(), organizations)
+        except SlingUnavailable as e:
+            return self._send_error(502, str(e))
+        etag = 'W/"{}"'.format(hashlib.sha256(
+            json.dumps([kind, fmt, page, page_size, start_date.isoformat(), end_date.isoformat(), range_hashes]).encode()
+        ).hexdigest()[:32])
+
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        with _responses_lock:
+            cached = _responses.get(etag)
+        if cached is None:
+            try:
+                report_df = build_report(kind, analyzers, organizations)
+            except SlingUnavailable as e:
+                return self._send_error(502, str(e))
+            meta = {
+                'report': kind,
+                'start': start_date.isoformat(),
+                'end': end_date.isoformat(),
+                'organizations': [org['id'] for org in organizations],
+                'page': page,
+                'page_size': page_size
+            }
+            try:
+                body, content_type = render_page(report_df, fmt, meta)
+            except ImportError:
+                return self._send_error(406, "Parquet output needs pyarrow or fastparquet installed")
+            cached = (body, content_type, len(report_df))
+            with _responses_lock:
+                _responses[etag] = cached
+                while len(_responses) > RESPONSE_CACHE_SIZE:
+                    _responses.popitem(last=False)
+        else:
+            with _responses_lock:
+                _responses.move_to_end(etag)
+
+        body, content_type, total = cached
+        links = []
+        if page * page_size < total:
+            links.append(f'<{url.path}?{urlencode({**params, "page": page + 1})}>; rel="next"')
+        if page > 1:
+            links.append(f'<{url.path}?{urlencode({**params, "page": page - 1})}>; rel="prev"')
+        self._send_body(200, body, content_type, {
+            'ETag': etag,
+            'Cache-Control': 'no-cache',
+            'X-Total-Count': str(total),
+            **({'Link': ', '.join(links)} if links else {})
+        })
+
+    def _send_body(self, status, body, content_type, headers=None):
+        if len(body) >= GZIP_MIN_SIZE and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            headers = {**(headers or {}), 'Content-Encoding': 'gzip'}
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Vary', 'Accept-Encoding')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_body(status, json.dumps({'error': message}).encode(), 'application/json')
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve attendance reports as JSON or Parquet")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--api-base', default=os.environ.get('SLING_API_BASE'),
+                        help="Sling API base URL, e.g. a local stub for testing")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), ReportHandler)
+    server.organizations = get_process_organizations()
+    server.api_base = args.api_base
+    print(f"Serving attendance reports on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
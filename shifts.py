@@ -1,24 +1,23 @@
 import streamlit as st
 import requests
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import time
+from bisect import bisect_right
+import numpy as np
+from sling import get_session, fetch_user_directory, get_organizations, get_rate_limiter, run_per_org
 
-def fetch_users():
+def fetch_users(org=None):
     """Fetch users from Sling API with concise information"""
-    url = f'{st.secrets["SLING_API_BASE"]}/{st.secrets["SLING_ORG_ID"]}/users/concise'
+    org = org or get_organizations()[0]
+    url = f'{st.secrets["SLING_API_BASE"]}/{org["id"]}/users/concise'
     params = {
         'nonce': '1738160741741',
         'user-fields': 'full'
     }
-    headers = {
-        "Authorization": st.secrets["SLING_API_KEY"]
-    }
     
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        return response.json()
+        return fetch_user_directory(url, org['id'], org['api_key'], org['rate_limit'], params)
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching users: {str(e)}")
         return []
@@ -34,6 +33,19 @@ DAY_MAPPINGS = {
     'Sunday': 'SU'
 }
 
+# Shift times per shift type in UTC (Pakistan time UTC+5):
+# (start time, end time, summary, days between start and end date)
+SHIFT_TYPES = {
+    # 8 PM PKT = 15:00 UTC, ending at 4 AM PKT next day = 23:00 UTC same day
+    "8-hour": ("15:00:00.000", "23:00:00.000", "8-Hour Night Shift (8 PM - 4 AM PKT)", 0),
+    # 10 PM PKT = 17:00 UTC, ending at 8 AM PKT next day
+    "10-hour-late": ("17:00:00.000", "03:00:00.000", "10-Hour Night Shift (10 PM - 8 AM PKT)", 1),
+    # 8 PM PKT = 15:00 UTC, ending at 6 AM PKT next day
+    "10-hour-early": ("15:00:00.000", "01:00:00.000", "10-Hour Night Shift (8 PM - 6 AM PKT)", 1),
+    # 8 PM PKT = 15:00 UTC, ending at 8 AM PKT next day
+    "12-hour": ("15:00:00.000", "03:00:00.000", "12-Hour Night Shift (8 PM - 8 AM PKT)", 1),
+}
+
 def get_position_from_groups(group_ids, groups):
     """Helper function to determine position from group IDs"""
     position_priority = {
@@ -52,74 +64,76 @@ def get_position_from_groups(group_ids, groups):
     
     return 'Sales Agent', 21678699
 
-def create_shift(user_id, position_id, start_date, selected_days, interval, shift_type):
-    """Create shift for a user"""
-    url = f'{st.secrets["SLING_API_BASE"]}/{st.secrets["SLING_ORG_ID"]}/shifts/bulk'
+def build_shift_rrules(selection, start_date):
+    """Collapse a boolean (employees x days) selection into weekly rrules per employee
+    
+    Each week is reduced to a weekday bitmask and consecutive weeks with the same
+    mask share one rrule. Returns a list per employee of (first_date, byday, until_date).
+    """
+    n_employees, n_days = selection.shape
+    n_weeks = n_days // 7
+    weeks = selection[:, :n_weeks * 7].reshape(n_employees, n_weeks, 7)
+    masks = weeks @ (1 << np.arange(7))
+    
+    # Bit j of a mask is the day start_date + j; order byday codes by weekday
+    weekdays = list(DAY_MAPPINGS.values())
+    offsets = sorted(range(7), key=lambda j: (start_date + timedelta(days=j)).weekday())
+    
+    # A new run starts wherever the mask differs from the previous week
+    run_starts = np.ones((n_employees, n_weeks), dtype=bool)
+    run_starts[:, 1:] = masks[:, 1:] != masks[:, :-1]
+    
+    rrules = [[] for _ in range(n_employees)]
+    for emp, week in zip(*np.nonzero(run_starts & (masks > 0))):
+        run_end = week + 1
+        while run_end < n_weeks and not run_starts[emp, run_end]:
+            run_end += 1
+        mask = int(masks[emp, week])
+        week_start = start_date + timedelta(days=7 * int(week))
+        first_offset = (mask & -mask).bit_length() - 1
+        byday = ','.join(
+            weekdays[(start_date + timedelta(days=j)).weekday()] for j in offsets if mask >> j & 1
+        )
+        until_date = start_date + timedelta(days=7 * int(run_end) - 1)
+        rrules[emp].append((week_start + timedelta(days=first_offset), byday, until_date))
+    return rrules
+
+def create_shift(user_id, position_id, rrules, shift_type, org=None):
+    """Create shifts for a user, one recurring shift per rrule in a single bulk request"""
+    org = org or get_organizations()[0]
+    url = f'{st.secrets["SLING_API_BASE"]}/{org["id"]}/shifts/bulk'
     headers = {
-        "Authorization": st.secrets["SLING_API_KEY"],
+        "Authorization": org['api_key'],
         "Content-Type": "application/json"
     }
     
-    # Convert selected days to RRULE format
-    byday = ','.join([DAY_MAPPINGS[day] for day, selected in selected_days.items() if selected])
-    
-    # Calculate until date based on interval
-    until_date = start_date + timedelta(days=(7 * interval - 1))
-    until_str = f"{until_date.strftime('%Y-%m-%d')}T23:59:59.000Z"
-    
-    # Set shift times based on shift type (Pakistan time UTC+5)
-    if shift_type == "8-hour":
-        # 8 PM PKT = 15:00 UTC
-        shift_start = "15:00:00.000"  # 8 PM PKT
-        # For 8-hour shift ending at 4 AM PKT next day = 23:00 UTC same day
-        shift_end = "23:00:00.000"    # 4 AM PKT next day
-        summary = "8-Hour Night Shift (8 PM - 4 AM PKT)"
-        # For 8-hour shift, end time is on the same UTC day
-        next_day = start_date
-    elif shift_type == "10-hour-late":
-        # 10 PM PKT = 17:00 UTC
-        shift_start = "17:00:00.000"  # 10 PM PKT
-        shift_end = "03:00:00.000"    # 8 AM PKT next day
-        summary = "10-Hour Night Shift (10 PM - 8 AM PKT)"
-        next_day = start_date + timedelta(days=1)
-    elif shift_type == "10-hour-early":
-        # 8 PM PKT = 15:00 UTC
-        shift_start = "15:00:00.000"  # 8 PM PKT
-        shift_end = "01:00:00.000"    # 6 AM PKT next day
-        summary = "10-Hour Night Shift (8 PM - 6 AM PKT)"
-        next_day = start_date + timedelta(days=1)
-    else:  # 12-hour
-        # 8 PM PKT = 15:00 UTC
-        shift_start = "15:00:00.000"  # 8 PM PKT
-        shift_end = "03:00:00.000"    # 8 AM PKT next day
-        summary = "12-Hour Night Shift (8 PM - 8 AM PKT)"
-        next_day = start_date + timedelta(days=1)
-    
-    # Create shift start and end time strings
-    shift_start_str = f"{start_date.strftime('%Y-%m-%d')}T{shift_start}Z"
-    shift_end_str = f"{next_day.strftime('%Y-%m-%d')}T{shift_end}Z"
+    shift_start, shift_end, summary, overnight = SHIFT_TYPES.get(shift_type, SHIFT_TYPES["12-hour"])
     
     # Create shift data
-    shift_data = [{
-        "user": {"id": user_id},
-        "summary": summary,
-        "location": {"id": 22425442},
-        "position": {"id": position_id},
-        "dtstart": shift_start_str,
-        "dtend": shift_end_str,
-        "breakduration": 60,
-        "status": "published",
-        "rrule": {
-            "freq": "WEEKLY",
-            "byday": byday,
-            "interval": 1,
-            "until": until_str
-        }
-    }]
+    shift_data = []
+    for first_date, byday, until_date in rrules:
+        next_day = first_date + timedelta(days=overnight)
+        shift_data.append({
+            "user": {"id": user_id},
+            "summary": summary,
+            "location": {"id": 22425442},
+            "position": {"id": position_id},
+            "dtstart": f"{first_date.strftime('%Y-%m-%d')}T{shift_start}Z",
+            "dtend": f"{next_day.strftime('%Y-%m-%d')}T{shift_end}Z",
+            "breakduration": 60,
+            "status": "published",
+            "rrule": {
+                "freq": "WEEKLY",
+                "byday": byday,
+                "interval": 1,
+                "until": f"{until_date.strftime('%Y-%m-%d')}T23:59:59.000Z"
+            }
+        })
     
     try:
         # st.write("Sending shift data:", shift_data)  # Debug print
-        response = requests.post(url, headers=headers, json=shift_data)
+        get_rate_limiter(org['id'], org['rate_limit']).wait()
+        response = get_session().post(url, headers=headers, json=shift_data)
         if response.status_code != 200:
             st.error(f"API Response: {response.text}")  # Debug print
         response.raise_for_status()
@@ -128,24 +142,154 @@ def create_shift(user_id, position_id, start_date, selected_days, interval, shif
         st.error(f"Error creating shift: {str(e)}")
         return False
 
-def fetch_shifts(start_date, end_date):
-    """Fetch shifts from Sling API for given date range"""
-    url = f'{st.secrets["SLING_API_BASE"]}/{st.secrets["SLING_ORG_ID"]}/reports/timesheets'
-    params = {
-        'dates': f"{start_date}/{end_date}"
-    }
-    headers = {
-        "Authorization": st.secrets["SLING_API_KEY"]
+def get_shift_selections(employee_ids, start_date, n_days, conflicts):
+    """Editor input for the current employees, dates and conflicts from session state
+    
+    The editor's data is part of its identity, so the matrix is only rebuilt when
+    that layout changes; the latest edits are then carried over to the new layout.
+    """
+    layout = (tuple(employee_ids), start_date, n_days, conflicts.tobytes())
+    stored = st.session_state.get('shift_selections')
+    if stored and stored['layout'] == layout:
+        return stored['selection']
+    
+    selection = np.zeros((len(employee_ids), n_days), dtype=bool)
+    if stored:
+        offset = (start_date - stored['start_date']).days
+        columns = np.arange(n_days) + offset
+        valid = (columns >= 0) & (columns < stored['edited'].shape[1])
+        previous_rows = {emp_id: row for row, emp_id in enumerate(stored['employee_ids'])}
+        for row, emp_id in enumerate(employee_ids):
+            if emp_id in previous_rows:
+                selection[row, valid] = stored['edited'][previous_rows[emp_id], columns[valid]]
+    
+    st.session_state.shift_selections = {
+        'layout': layout,
+        'employee_ids': employee_ids,
+        'start_date': start_date,
+        'selection': selection,  # Editor input, unchanged until the layout changes
+        'edited': selection  # Latest edited values, only used to seed a new layout
     }
+    return selection
+
+# Seconds fetched shifts are reused across reruns (every editor click is a rerun)
+SHIFTS_TTL = 60
+
+@st.cache_data(ttl=SHIFTS_TTL, show_spinner=False)
+def _fetch_shifts_cached(url, org_id, api_key, rate_limit, dates):
+    """Fetch shifts once per organization, range and TTL; errors are raised, not cached"""
+    get_rate_limiter(org_id, rate_limit).wait()
+    response = get_session().get(url, headers={"Authorization": api_key}, params={'dates': dates})
+    response.raise_for_status()
+    return response.json()
+
+def fetch_shifts(start_date, end_date, org=None):
+    """Fetch shifts from Sling API for given date range"""
+    org = org or get_organizations()[0]
+    url = f'{st.secrets["SLING_API_BASE"]}/{org["id"]}/reports/timesheets'
     
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        return response.json()
+        return _fetch_shifts_cached(url, org['id'], org['api_key'], org['rate_limit'], f"{start_date}/{end_date}")
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching shifts: {str(e)}")
         return []
 
+def parse_sling_datetime(value):
+    """Parse a Sling timestamp into a naive UTC datetime"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+class ShiftIntervalIndex:
+    """Per-user index of existing shift intervals for overlap checks in O(log n)"""
+
+    def __init__(self, shifts_data, horizon):
+        weekdays = list(DAY_MAPPINGS.values())
+        intervals = {}
+        
+        for shift in shifts_data:
+            if not shift.get('user'):
+                continue
+            try:
+                shift_start = parse_sling_datetime(shift['dtstart'])
+                duration = parse_sling_datetime(shift['dtend']) - shift_start
+                spans = intervals.setdefault(str(shift['user']['id']), [])
+                spans.append((shift_start, shift_start + duration))
+                
+                # Expand recurring shifts the same way the shifts view does
+                if 'rrule' in shift:
+                    byday = shift['rrule'].get('byday', '').split(',')
+                    until = min(parse_sling_datetime(shift['rrule']['until']).date(), horizon)
+                    current_date = shift_start.date() + timedelta(days=1)
+                    while current_date <= until:
+                        if weekdays[current_date.weekday()] in byday:
+                            occurrence = datetime.combine(current_date, shift_start.time())
+                            spans.append((occurrence, occurrence + duration))
+                        current_date += timedelta(days=1)
+            except (KeyError, TypeError, ValueError):
+                continue
+        
+        # Merge overlapping intervals so starts and ends are both sorted
+        self._starts = {}
+        self._ends = {}
+        for user_id, spans in intervals.items():
+            starts, ends = [], []
+            for start, end in sorted(spans):
+                if starts and start <= ends[-1]:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self._starts[user_id] = starts
+            self._ends[user_id] = ends
+
+    def overlaps(self, user_id, start, end):
+        """Check whether [start, end) overlaps any existing shift of the user"""
+        ends = self._ends.get(str(user_id))
+        if not ends:
+            return False
+        # First existing interval ending after the proposed start
+        i = bisect_right(ends, start)
+        return i < len(ends) and self._starts[str(user_id)][i] < end
+
+def find_shift_conflicts(index, employee_ids, dates, shift_type):
+    """Build a boolean matrix (employees x dates) of proposed shifts that overlap existing ones"""
+    shift_start, shift_end, _, overnight = SHIFT_TYPES.get(shift_type, SHIFT_TYPES["12-hour"])
+    start_time = datetime.strptime(shift_start, "%H:%M:%S.%f").time()
+    end_time = datetime.strptime(shift_end, "%H:%M:%S.%f").time()
+    
+    conflicts = np.zeros((len(employee_ids), len(dates)), dtype=bool)
+    for i, emp_id in enumerate(employee_ids):
+        for j, date in enumerate(dates):
+            start = datetime.combine(date, start_time)
+            end = datetime.combine(date + timedelta(days=overnight), end_time)
+            conflicts[i, j] = index.overlaps(emp_id, start, end)
+    return conflicts
+
+@st.cache_resource(ttl=SHIFTS_TTL, show_spinner=False)
+def _shift_index_cached(url, org_id, api_key, rate_limit, dates, horizon):
+    """Interval index built once per fetched shifts payload, shared read-only across reruns"""
+    return ShiftIntervalIndex(_fetch_shifts_cached(url, org_id, api_key, rate_limit, dates), horizon)
+
+def get_shift_index(start_date, end_date, org):
+    """Interval index of an organization's shifts, keyed like fetch_shifts"""
+    url = f'{st.secrets["SLING_API_BASE"]}/{org["id"]}/reports/timesheets'
+    
+    try:
+        return _shift_index_cached(url, org['id'], org['api_key'], org['rate_limit'], f"{start_date}/{end_date}", end_date)
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching shifts: {str(e)}")
+        return ShiftIntervalIndex([], end_date)
+
+def conflict_labels(conflicts, dates):
+    """Per employee, the proposed days that overlap an existing shift as display text"""
+    return [
+        ', '.join(f"{date.strftime('%a')} ({date.strftime('%d').lstrip('0')} {date.strftime('%b')})"
+                  for date, conflict in zip(dates, row) if conflict)
+        for row in conflicts
+    ]
+
 def process_shifts_view(shifts_data, start_date, end_date, users_data):
     """Process shifts data and create a display table"""
     # Create date range
@@ -228,12 +372,36 @@ def main():
     with col2:
         end_view_date = st.date_input("Select End Date", value=(datetime.now().date() + timedelta(days=30)))
     
-    shifts_data = fetch_shifts(start_view_date.strftime("%Y-%m-%d"), end_view_date.strftime("%Y-%m-%d"))
-    users_data = fetch_users()
+    organizations = get_organizations()
+    view_orgs = organizations
+    if len(organizations) > 1:
+        org_names = st.multiselect(
+            "Organizations",
+            [org['name'] for org in organizations],
+            default=[org['name'] for org in organizations]
+        )
+        view_orgs = [org for org in organizations if org['name'] in org_names]
+    
+    # Fetch every organization concurrently over the shared pool
+    view_data = run_per_org(
+        lambda org: (
+            fetch_shifts(start_view_date.strftime("%Y-%m-%d"), end_view_date.strftime("%Y-%m-%d"), org),
+            fetch_users(org)
+        ),
+        view_orgs
+    )
     
-    if shifts_data and users_data:
-        # Process shifts and create display table
-        shifts_df, date_range = process_shifts_view(shifts_data, start_view_date, end_view_date, users_data)
+    shift_frames = []
+    for org, (shifts_data, users_data) in zip(view_orgs, view_data):
+        if shifts_data and users_data:
+            # Process shifts and create display table
+            org_shifts_df, date_range = process_shifts_view(shifts_data, start_view_date, end_view_date, users_data)
+            if len(organizations) > 1:
+                org_shifts_df.insert(0, 'Organization', org['name'])
+            shift_frames.append(org_shifts_df)
+    
+    if shift_frames:
+        shifts_df = pd.concat(shift_frames, ignore_index=True)
         
         # Display legend
         st.markdown("#### Shift Legend:")
@@ -245,6 +413,10 @@ def main():
             shifts_df,
             hide_index=True,
             column_config={
+                'Organization': st.column_config.Column(
+                    'Organization',
+                    width='small'
+                ),
                 'Employee': st.column_config.Column(
                     'Employee',
                     width='medium'
@@ -276,6 +448,11 @@ def main():
     
     st.write("### Create Shifts")
     
+    create_org = organizations[0]
+    if len(organizations) > 1:
+        create_org_name = st.selectbox("Create Shifts In", [org['name'] for org in organizations])
+        create_org = next(org for org in organizations if org['name'] == create_org_name)
+    
     # Add shift type selection with both 10-hour options
     shift_type = st.radio(
         "Select Shift Type",
@@ -302,7 +479,7 @@ def main():
             key=f"interval_{st.session_state.interval_key}"
         )
     
-    response_data = fetch_users()
+    response_data = fetch_users(create_org)
     
     if response_data and 'users' in response_data and 'groups' in response_data:
         all_employees = []
@@ -339,45 +516,31 @@ def main():
             )
             
             if selected_names:
-                # Initialize shift selections
-                if 'shift_selections' not in st.session_state:
-                    st.session_state.shift_selections = {}
-                
                 # Create date range for the interval
-                dates = []
-                current_date = start_date
-                for _ in range(7 * interval):
-                    dates.append(current_date)
-                    current_date += timedelta(days=1)
+                dates = [start_date + timedelta(days=offset) for offset in range(7 * interval)]
+                date_columns = [date.strftime("%Y-%m-%d") for date in dates]
+                employee_ids = [employee_options[name]['id'] for name in selected_names]
                 
-                # Create the shift selection table
-                shift_selection_data = []
+                # Check proposed shifts against existing ones before anything is sent
+                index_start = start_date
+                index_end = dates[-1] + timedelta(days=1)
+                if create_org in view_orgs and start_view_date <= index_start and index_end <= end_view_date:
+                    # Reuse the shifts already fetched for the view above
+                    index_start, index_end = start_view_date, end_view_date
+                shift_index = get_shift_index(index_start, index_end, create_org)
+                conflicts = find_shift_conflicts(shift_index, employee_ids, dates, shift_type)
                 
-                for name in selected_names:
-                    employee = employee_options[name]
-                    emp_id = employee['id']
-                    
-                    # Initialize shift selections for this employee if not exists
-                    if emp_id not in st.session_state.shift_selections:
-                        st.session_state.shift_selections[emp_id] = {}
-                    
-                    # Update shift selections with any new dates
-                    for date in dates:
-                        date_str = date.strftime("%Y-%m-%d")
-                        if date_str not in st.session_state.shift_selections[emp_id]:
-                            st.session_state.shift_selections[emp_id][date_str] = False
-                    
-                    row = {'Employee': employee['display_name']}
-                    
-                    # Add date columns
-                    for date in dates:
-                        date_str = date.strftime("%Y-%m-%d")
-                        row[date_str] = st.session_state.shift_selections[emp_id][date_str]
-                    
-                    shift_selection_data.append(row)
+                # Create the shift selection table from the stored selection matrix
+                selection_df = pd.DataFrame(
+                    get_shift_selections(employee_ids, start_date, len(dates), conflicts),
+                    columns=date_columns
+                )
+                selection_df.insert(0, 'Employee', [employee_options[name]['display_name'] for name in selected_names])
+                # Styles only render on read-only columns, so conflicts are listed per employee
+                selection_df.insert(1, 'Conflicts', conflict_labels(conflicts, dates))
                 
-                # Create DataFrame
-                selection_df = pd.DataFrame(shift_selection_data)
+                if conflicts.any():
+                    st.warning("⚠️ Days listed under Existing Shift Overlaps will be skipped")
                 
                 # Create the interactive table
                 edited_df = st.data_editor(
@@ -389,6 +552,11 @@ def main():
                             width='medium',
                             required=True
                         ),
+                        'Conflicts': st.column_config.TextColumn(
+                            'Existing Shift Overlaps',
+                            width='medium',
+                            disabled=True
+                        ),
                         **{
                             date.strftime("%Y-%m-%d"): st.column_config.CheckboxColumn(
                                 f"{date.strftime('%a')} ({date.strftime('%d').lstrip('0')} {date.strftime('%b')})",
@@ -400,6 +568,10 @@ def main():
                     },
                     key="shift_selection_table"
                 )
+                
+                # Remember the edits as one boolean matrix without feeding them back into the editor
+                selection = edited_df[date_columns].to_numpy(dtype=bool)
+                st.session_state.shift_selections['edited'] = selection
 
                 # Add a single Create Shifts button for all employees
                 if st.button("Create Shifts for All Selected Employees"):
@@ -415,31 +587,26 @@ def main():
                     success_count = 0
                     messages = []
                     
-                    employees_to_process = selected_names.copy()
+                    skipped = (selection & conflicts).sum(axis=1)
+                    rrules = build_shift_rrules(selection & ~conflicts, start_date)
                     
-                    for index, name in enumerate(employees_to_process):
+                    for index, name in enumerate(selected_names):
                         employee = employee_options[name]
-                        selected_days = {}
                         
-                        employee_row = edited_df[edited_df['Employee'] == employee['display_name']]
+                        if skipped[index] and rrules[index]:
+                            messages.append(("warning", f"⚠️ Skipped {skipped[index]} day(s) for {employee['full_name']} (overlaps an existing shift)"))
                         
-                        if not employee_row.empty:
-                            for date in dates:
-                                day_name = date.strftime("%A")
-                                date_str = date.strftime("%Y-%m-%d")
-                                selected_days[day_name] = employee_row[date_str].iloc[0]
-                            
-                            if any(selected_days.values()):
-                                try:
-                                    if create_shift(employee['id'], employee['position_id'], start_date, selected_days, interval, shift_type):
-                                        messages.append(("success", f"✅ Shift created successfully for {employee['full_name']}"))
-                                        success_count += 1
-                                except Exception as e:
-                                    messages.append(("error", f"❌ Error creating shift for {employee['full_name']}: {str(e)}"))
-                            else:
-                                messages.append(("warning", f"⚠️ Please select at least one day for {employee['full_name']}"))
+                        if rrules[index]:
+                            try:
+                                if create_shift(employee['id'], employee['position_id'], rrules[index], shift_type, create_org):
+                                    messages.append(("success", f"✅ Shift created successfully for {employee['full_name']}"))
+                                    success_count += 1
+                            except Exception as e:
+                                messages.append(("error", f"❌ Error creating shift for {employee['full_name']}: {str(e)}"))
+                        elif selection[index].any():
+                            messages.append(("warning", f"⚠️ All {skipped[index]} selected day(s) for {employee['full_name']} overlap an existing shift and were skipped"))
                         else:
-                            messages.append(("error", f"❌ Could not find data for {employee['full_name']}"))
+                            messages.append(("warning", f"⚠️ Please select at least one day for {employee['full_name']}"))
                         
                         progress_bar.progress((index + 1) / total_employees)
                         
@@ -455,16 +622,23 @@ def main():
                     if success_count > 0:
                         st.info(f"✨ Successfully created shifts for {success_count} out of {total_employees} employees")
                         # Reset all session state variables
-                        st.session_state.shift_selections = {}
+                        st.session_state.pop('shift_selections', None)
                         st.session_state.shift_type_key += 1
                         st.session_state.start_date_key += 1
                         st.session_state.interval_key += 1
                         st.session_state.selected_employees_key += 1
+                        # Show the new shifts and check against them on the next run
+                        _fetch_shifts_cached.clear()
+                        _shift_index_cached.clear()
                         # Clear the selection table key
                         if "shift_selection_table" in st.session_state:
                             del st.session_state["shift_selection_table"]
                         time.sleep(2)
                         st.rerun()
+                    elif (selection & ~conflicts).any():
+                        st.error("No shifts were created. See the errors above.")
+                    elif selection.any():
+                        st.error("No shifts were created. Every selected day overlaps an existing shift.")
                     else:
                         st.error("No shifts were created. Please select days for at least one employee.")
 
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# How long a fetched user directory is reused before refetching (seconds)
+USER_DIRECTORY_TTL = 600
+# Requests per second per organization unless configured otherwise
+DEFAULT_RATE_LIMIT = 10
+# Organizations fetched at the same time; the HTTP pool is sized to match
+MAX_CONCURRENT_ORGS = 8
+
+class SlingUnavailable(Exception):
+    """Raised instead of an empty fallback when a caller must not mistake a failed fetch for no data"""
+
+@st.cache_resource(show_spinner=False)
+def get_session():
+    """Shared HTTP session for Sling API calls, created once per process"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=MAX_CONCURRENT_ORGS, pool_maxsize=MAX_CONCURRENT_ORGS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+@st.cache_resource(show_spinner=False)
+def get_executor():
+    """Bounded worker pool shared by all per-organization fetches"""
+    return ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ORGS, thread_name_prefix="sling")
+
+@st.cache_resource(ttl=USER_DIRECTORY_TTL, show_spinner=False)
+def fetch_user_directory(url, org_id, authorization, rate_limit=DEFAULT_RATE_LIMIT, params=None):
+    """Fetch a Sling user listing once per process and TTL; errors are raised, not cached"""
+    get_rate_limiter(org_id, rate_limit).wait()
+    response = get_session().get(url, headers={'Authorization': authorization}, params=params)
+    response.raise_for_status()
+    return response.json()
+
+def get_organizations():
+    """Configured Sling organizations, each with its own credentials
+
+    Several organizations are configured as [[SLING_ORGS]] tables (id, name,
+    api_key and optionally rate_limit); otherwise the single SLING_ORG_ID is used.
+    """
+    if "SLING_ORGS" in st.secrets:
+        return [
+            {
+                'id': str(org['id']),
+                'name': org.get('name', str(org['id'])),
+                'api_key': org['api_key'],
+                'rate_limit': org.get('rate_limit', DEFAULT_RATE_LIMIT)
+            }
+            for org in st.secrets["SLING_ORGS"]
+        ]
+    return [{
+        'id': str(st.secrets["SLING_ORG_ID"]),
+        'name': str(st.secrets["SLING_ORG_ID"]),
+        'api_key': st.secrets["SLING_API_KEY"],
+        'rate_limit': DEFAULT_RATE_LIMIT
+    }]
+
+def get_process_organizations():
+    """Organizations for standalone processes (warm-up, report service)
+
+    SLING_ORG_ID / SLING_API_KEY in the environment select a single organization,
+    otherwise the configured ones are used.
+    """
+    if os.environ.get('SLING_ORG_ID'):
+        return [{
+            'id': os.environ['SLING_ORG_ID'],
+            'name': os.environ['SLING_ORG_ID'],
+            'api_key': os.environ.get('SLING_API_KEY') or st.secrets["SLING_API_KEY"],
+            'rate_limit': DEFAULT_RATE_LIMIT
+        }]
+    return get_organizations()
+
+class RateLimiter:
+    """Spaces out requests so they stay under a number of requests per second"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+@st.cache_resource(show_spinner=False)
+def get_rate_limiter(org_id, rate=DEFAULT_RATE_LIMIT):
+    """Per-organization rate limiter shared across sessions and threads"""
+    return RateLimiter(rate)
+
+def run_per_org(func, organizations):
+    """Run func(org) for every organization concurrently, returning results in the same order"""
+    ctx = get_script_run_ctx(suppress_warning=True)
+
+    def run(org):
+        # Let Streamlit calls made by func render in the calling session
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return func(org)
+
+    futures = [get_executor().submit(run, org) for org in organizations]
+    return [future.result() for future in futures]
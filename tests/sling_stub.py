@@ -0,0 +1,66 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+def default_timesheets(day):
+    """Ann clocks in 30 minutes late, Bo is scheduled but never clocks in"""
+    return [
+        {
+            'user': {'id': 1},
+            'dtstart': f'{day}T15:00:00Z',
+            'dtend': f'{day}T23:00:00Z',
+            'timesheetEntries': [
+                {'type': 'clock_in', 'timestamp': f'{day}T15:30:00Z'},
+                {'type': 'clock_out', 'timestamp': f'{day}T23:00:00Z'}
+            ]
+        },
+        {'user': {'id': 2}, 'dtstart': f'{day}T15:00:00Z', 'dtend': f'{day}T23:00:00Z'}
+    ]
+
+class StubSlingHandler(BaseHTTPRequestHandler):
+    """Minimal Sling API: two users with a shift on every day
+    
+    server.timesheets overrides the payload of a day, server.fail answers every
+    request with a 500 and server.timesheet_requests records each day fetched.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.server.fail:
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        url = urlparse(self.path)
+        if url.path.endswith('/users'):
+            body = [
+                {'id': 1, 'email': 'ann@example.com', 'firstname': 'Ann', 'lastname': 'Lee'},
+                {'id': 2, 'email': 'bo@example.com', 'firstname': 'Bo', 'lastname': 'Ng'}
+            ]
+        else:
+            day = parse_qs(url.query)['dates'][0].split('/')[0]
+            self.server.timesheet_requests.append(day)
+            body = self.server.timesheets.get(day) or default_timesheets(day)
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def start_stub():
+    """Serve the stub API on a free local port; returns the server and its API base URL"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubSlingHandler)
+    server.timesheet_requests = []
+    server.timesheets = {}
+    server.fail = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/v1'
+
+def stop_stub(server):
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,107 @@
+import gzip
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date, datetime, timedelta
+from http.server import ThreadingHTTPServer
+
+import report_service
+from report_service import MAX_RANGE_DAYS, ReportHandler, ServiceAnalyzer
+from sling_stub import start_stub, stop_stub
+
+class ReportServiceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stub, cls.api_base = start_stub()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ReportHandler)
+        cls.server.organizations = [{'id': '42', 'name': 'Main', 'api_key': 'test', 'rate_limit': 100}]
+        cls.server.api_base = cls.api_base
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        stop_stub(cls.stub)
+
+    def setUp(self):
+        self.stub.timesheet_requests.clear()
+        self.stub.fail = False
+        report_service._responses.clear()
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.workdir.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def get(self, path, headers=None):
+        connection = http.client.HTTPConnection('127.0.0.1', self.server.server_address[1])
+        self.addCleanup(connection.close)
+        connection.request('GET', path, headers=headers or {})
+        response = connection.getresponse()
+        return response, response.read()
+
+    def test_etag_answers_304_without_sling_traffic(self):
+        response, body = self.get('/summary?start=2025-01-01&end=2025-01-07')
+        self.assertEqual(response.status, 200)
+        records = json.loads(body)['records']
+        self.assertEqual({record['Full Name']: record['Days Absent'] for record in records}, {'Ann Lee': 0, 'Bo Ng': 7})
+        etag = response.getheader('ETag')
+
+        self.stub.timesheet_requests.clear()
+        response, body = self.get('/summary?start=2025-01-01&end=2025-01-07', {'If-None-Match': etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.getheader('ETag'), etag)
+        self.assertEqual(body, b'')
+        self.assertEqual(self.stub.timesheet_requests, [])
+
+    def test_gzip_and_pagination(self):
+        response, body = self.get('/events?start=2025-01-01&end=2025-01-31&page_size=40', {'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader('Content-Encoding'), 'gzip')
+        # Every day Ann arrives late and Bo is absent
+        page = json.loads(gzip.decompress(body))
+        self.assertEqual((page['total'], len(page['records'])), (62, 40))
+        self.assertEqual(response.getheader('X-Total-Count'), '62')
+        self.assertIn('rel="next"', response.getheader('Link'))
+
+    def test_range_too_long_is_rejected(self):
+        end_date = date(2025, 1, 1) + timedelta(days=MAX_RANGE_DAYS)
+        response, body = self.get(f'/summary?start=2025-01-01&end={end_date}')
+        self.assertEqual(response.status, 400)
+        self.assertIn('limited', json.loads(body)['error'])
+        self.assertEqual(self.stub.timesheet_requests, [])
+
+    def test_sling_failure_is_502_without_etag(self):
+        self.stub.fail = True
+        response, body = self.get('/summary?start=2024-12-01&end=2024-12-03')
+        self.assertEqual(response.status, 502)
+        self.assertIsNone(response.getheader('ETag'))
+        self.assertEqual(report_service._responses, {})
+
+        # Nothing from the failure is reused once Sling is back
+        self.stub.fail = False
+        response, body = self.get('/summary?start=2024-12-01&end=2024-12-03')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(len(json.loads(body)['records']), 2)
+
+    def test_report_reuses_the_timesheets_of_its_etag(self):
+        yesterday = datetime.now().date() - timedelta(days=1)
+        analyzer = ServiceAnalyzer(api_base=self.api_base, api_key='test', org_id='42')
+        analyzer.start_date = analyzer.end_date = yesterday
+        analyzer.open_day_ttl = 0
+        analyzer.range_hash()
+
+        # The open day changes in Sling, the report still matches the hash it was served under
+        self.stub.timesheets[yesterday.isoformat()] = []
+        self.addCleanup(self.stub.timesheets.clear)
+        summary_df = analyzer.analyze_attendance()
+        self.assertEqual(len(summary_df), 2)
+        self.assertEqual(analyzer.last_range_hash, analyzer.range_hash())
+        self.assertEqual(self.stub.timesheet_requests, [yesterday.isoformat()])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import random
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+
+from Reporting import AttendanceAnalyzer
+from sling_stub import start_stub, stop_stub
+
+ENTRY_TYPES = ['clock_in', 'clock_out', 'auto_clock_out', 'break_start', 'break_end']
+
+def random_timesheets(rng, day):
+    """Shifts for random users with random clock events around them"""
+    timesheets = []
+    for _ in range(rng.randint(0, 6)):
+        shift_start = datetime(day.year, day.month, day.day, 15)
+        timesheets.append({
+            'user': {'id': rng.randint(1, 3)},
+            'dtstart': f'{shift_start:%Y-%m-%dT%H:%M:%SZ}',
+            'dtend': f'{shift_start + timedelta(hours=8):%Y-%m-%dT%H:%M:%SZ}',
+            'timesheetEntries': [
+                {
+                    'type': rng.choice(ENTRY_TYPES),
+                    'timestamp': f'{shift_start + timedelta(minutes=rng.randint(-60, 600)):%Y-%m-%dT%H:%M:%SZ}'
+                }
+                for _ in range(rng.randint(0, 5))
+            ]
+        })
+    return timesheets
+
+class DayResultReuseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server, cls.api_base = start_stub()
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_stub(cls.server)
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.days = [date(2025, 1, 1) + timedelta(days=offset) for offset in range(20)]
+        self.server.timesheets = {day.isoformat(): random_timesheets(rng, day) for day in self.days}
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.workdir.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def analyzer(self, use_cache=True):
+        analyzer = AttendanceAnalyzer(api_base=self.api_base, api_key='test', org_id='42', rate_limit=1000)
+        analyzer.start_date = self.days[0]
+        analyzer.end_date = self.days[-1]
+        analyzer.use_cache = use_cache
+        return analyzer
+
+    def test_reused_results_match_full_recompute(self):
+        recompute = self.analyzer(use_cache=False)
+        expected = recompute.analyze_attendance()
+        self.assertEqual(len(recompute.recomputed_dates), len(self.days))
+
+        first = self.analyzer()
+        self.assertTrue(first.analyze_attendance().equals(expected))
+        second = self.analyzer()
+        self.assertTrue(second.analyze_attendance().equals(expected))
+        self.assertEqual(second.recomputed_dates, [])
+        self.assertEqual(second.last_range_hash, first.last_range_hash)
+
+        self.assertTrue(self.analyzer().analyze_events().equals(self.analyzer(use_cache=False).analyze_events()))
+
+    def test_only_changed_day_is_recomputed(self):
+        self.analyzer().analyze_attendance()
+
+        changed = self.days[4].isoformat()
+        self.server.timesheets[changed] = random_timesheets(random.Random(99), self.days[4])
+        refresh = self.analyzer()
+        refresh.refresh_timesheets = True
+        summary_df = refresh.analyze_attendance()
+
+        self.assertEqual(refresh.recomputed_dates, [changed])
+        self.assertTrue(summary_df.equals(self.analyzer(use_cache=False).analyze_attendance()))
+
+if __name__ == '__main__':
+    unittest.main()
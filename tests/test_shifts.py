@@ -0,0 +1,91 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from shifts import ShiftIntervalIndex, build_shift_rrules, conflict_labels, find_shift_conflicts
+
+def shift(user_id, dtstart, dtend, rrule=None):
+    entry = {'user': {'id': user_id}, 'dtstart': dtstart, 'dtend': dtend}
+    if rrule:
+        entry['rrule'] = rrule
+    return entry
+
+class ShiftIntervalIndexTest(unittest.TestCase):
+    def test_touching_intervals_do_not_overlap(self):
+        index = ShiftIntervalIndex([shift(1, '2025-02-03T15:00:00Z', '2025-02-03T23:00:00Z')], date(2025, 2, 28))
+
+        self.assertFalse(index.overlaps(1, datetime(2025, 2, 3, 23), datetime(2025, 2, 4, 7)))
+        self.assertFalse(index.overlaps(1, datetime(2025, 2, 3, 7), datetime(2025, 2, 3, 15)))
+        self.assertTrue(index.overlaps(1, datetime(2025, 2, 3, 22, 59), datetime(2025, 2, 4, 7)))
+        self.assertTrue(index.overlaps('1', datetime(2025, 2, 3, 16), datetime(2025, 2, 3, 17)))
+        self.assertFalse(index.overlaps(2, datetime(2025, 2, 3, 16), datetime(2025, 2, 3, 17)))
+
+    def test_overnight_shift_covers_next_morning(self):
+        index = ShiftIntervalIndex([shift(1, '2025-02-03T15:00:00Z', '2025-02-04T03:00:00Z')], date(2025, 2, 28))
+
+        self.assertTrue(index.overlaps(1, datetime(2025, 2, 4, 2), datetime(2025, 2, 4, 10)))
+        self.assertFalse(index.overlaps(1, datetime(2025, 2, 4, 3), datetime(2025, 2, 4, 10)))
+        # Timestamps with an offset are compared in UTC
+        index = ShiftIntervalIndex([shift(1, '2025-02-03T20:00:00+05:00', '2025-02-04T08:00:00+05:00')], date(2025, 2, 28))
+        self.assertTrue(index.overlaps(1, datetime(2025, 2, 4, 2), datetime(2025, 2, 4, 10)))
+
+    def test_recurrences_expand_up_to_until_and_horizon(self):
+        weekly = shift(1, '2025-02-03T15:00:00Z', '2025-02-04T03:00:00Z',
+                       {'byday': 'MO,WE', 'until': '2025-02-19T23:59:59Z'})  # 3 Feb is a Monday
+        index = ShiftIntervalIndex([weekly], date(2025, 2, 28))
+
+        for day in (3, 5, 10, 12, 17, 19):
+            self.assertTrue(index.overlaps(1, datetime(2025, 2, day, 16), datetime(2025, 2, day, 17)), day)
+        for day in (4, 6, 11, 24, 26):
+            self.assertFalse(index.overlaps(1, datetime(2025, 2, day, 16), datetime(2025, 2, day, 17)), day)
+        # Each occurrence keeps the overnight duration
+        self.assertTrue(index.overlaps(1, datetime(2025, 2, 13, 2), datetime(2025, 2, 13, 4)))
+
+        index = ShiftIntervalIndex([weekly], date(2025, 2, 10))
+        self.assertFalse(index.overlaps(1, datetime(2025, 2, 12, 16), datetime(2025, 2, 12, 17)))
+
+    def test_conflict_matrix_and_labels(self):
+        index = ShiftIntervalIndex([shift(7, '2025-02-04T17:00:00Z', '2025-02-05T03:00:00Z')], date(2025, 2, 28))
+        dates = [date(2025, 2, day) for day in (3, 4, 5)]
+
+        conflicts = find_shift_conflicts(index, [7, 8], dates, '8-hour')
+        np.testing.assert_array_equal(conflicts, [[False, True, False], [False, False, False]])
+        self.assertEqual(conflict_labels(conflicts, dates), ['Tue (4 Feb)', ''])
+
+class BuildShiftRrulesTest(unittest.TestCase):
+    def selection(self, start_date, n_weeks, days_by_employee):
+        selection = np.zeros((len(days_by_employee), 7 * n_weeks), dtype=bool)
+        for row, days in enumerate(days_by_employee):
+            for day in days:
+                selection[row, (day - start_date).days] = True
+        return selection
+
+    def test_identical_weeks_share_one_rrule_from_mid_week(self):
+        start_date = date(2025, 2, 5)  # a Wednesday
+        mondays_and_wednesdays = [start_date + timedelta(days=offset) for offset in (0, 5, 7, 12, 14, 19)]
+        rrules = build_shift_rrules(self.selection(start_date, 3, [mondays_and_wednesdays, []]), start_date)
+
+        self.assertEqual(rrules, [[(date(2025, 2, 5), 'MO,WE', date(2025, 2, 25))], []])
+
+    def test_first_date_is_first_selected_day(self):
+        start_date = date(2025, 2, 5)
+        rrules = build_shift_rrules(self.selection(start_date, 1, [[date(2025, 2, 10)]]), start_date)
+
+        self.assertEqual(rrules, [[(date(2025, 2, 10), 'MO', date(2025, 2, 11))]])
+
+    def test_changing_weeks_split_into_runs(self):
+        start_date = date(2025, 2, 3)  # a Monday
+        weeks = [('MO', 'TU'), ('MO', 'TU'), ('FR',), (), ('MO', 'TU')]
+        offsets = {'MO': 0, 'TU': 1, 'FR': 4}
+        days = [start_date + timedelta(days=7 * week + offsets[code]) for week, codes in enumerate(weeks) for code in codes]
+        rrules = build_shift_rrules(self.selection(start_date, len(weeks), [days]), start_date)
+
+        self.assertEqual(rrules, [[
+            (date(2025, 2, 3), 'MO,TU', date(2025, 2, 16)),
+            (date(2025, 2, 21), 'FR', date(2025, 2, 23)),
+            (date(2025, 3, 3), 'MO,TU', date(2025, 3, 9))
+        ]])
+
+if __name__ == '__main__':
+    unittest.main()
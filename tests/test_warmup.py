@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import unittest
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from Reporting import AttendanceAnalyzer, standard_periods
+from warmup import next_run_time, warm_up
+from sling_stub import start_stub, stop_stub
+
+class SchedulingTest(unittest.TestCase):
+    def test_standard_periods_end_yesterday(self):
+        periods = standard_periods(date(2025, 1, 15))  # a Wednesday
+        self.assertEqual(periods['Yesterday'], (date(2025, 1, 14), date(2025, 1, 14)))
+        self.assertEqual(periods['Week to Date'], (date(2025, 1, 13), date(2025, 1, 14)))
+        self.assertEqual(periods['Month to Date'], (date(2025, 1, 1), date(2025, 1, 14)))
+
+    def test_next_run_time(self):
+        now = datetime(2025, 1, 15, 7, 30)
+        self.assertEqual(next_run_time(now, ['06:00', '13:00']), datetime(2025, 1, 15, 13, 0))
+        self.assertEqual(next_run_time(now, ['06:00']), datetime(2025, 1, 16, 6, 0))
+
+class WarmUpTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server, cls.api_base = start_stub()
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_stub(cls.server)
+
+    def setUp(self):
+        self.server.timesheet_requests.clear()
+        self.server.fail = False
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.workdir.name)
+        self.addCleanup(os.chdir, cwd)
+        self.analyzer = AttendanceAnalyzer(api_base=self.api_base, api_key='test', org_id='42')
+
+    def test_run_records_durations_and_summaries(self):
+        run = warm_up(self.analyzer, lookback_days=3, today=date(2025, 1, 15))
+
+        self.assertEqual(
+            set(run['durations']),
+            {'users', 'timesheets', 'Yesterday', 'Week to Date', 'Month to Date', 'total'}
+        )
+        with open(os.path.join(self.analyzer.cache_dir, 'warmup_runs.jsonl')) as f:
+            self.assertEqual([json.loads(line) for line in f], [run])
+
+        summary_df, _ = self.analyzer.load_summary(date(2025, 1, 13), date(2025, 1, 14))
+        self.assertIsNotNone(summary_df)
+        bo = summary_df.set_index('Full Name').loc['Bo Ng']
+        self.assertEqual(bo['Days Absent'], 2)
+
+    def test_every_day_fetched_once_and_lookback_refreshed(self):
+        warm_up(self.analyzer, lookback_days=3, today=date(2025, 1, 15))
+        # Month to date covers 14 days, each fetched exactly once across the three periods
+        self.assertEqual(sorted(self.server.timesheet_requests), [f'2025-01-{day:02d}' for day in range(1, 15)])
+
+        self.server.timesheet_requests.clear()
+        warm_up(self.analyzer, lookback_days=3, today=date(2025, 1, 15))
+        # Settled days come from the cache, only the lookback days are refetched
+        self.assertEqual(sorted(self.server.timesheet_requests), ['2025-01-12', '2025-01-13', '2025-01-14'])
+
+    def test_open_days_fetched_once_per_run_and_reused(self):
+        today = datetime.now().date()
+        periods = standard_periods(today)
+        period_days = {
+            (start_date + timedelta(days=offset)).isoformat()
+            for start_date, end_date in periods.values()
+            for offset in range((end_date - start_date).days + 1)
+        }
+        lookback_days = {(today - timedelta(days=offset)).isoformat() for offset in range(1, 4)}
+
+        warm_up(self.analyzer, lookback_days=3, today=today)
+        # Yesterday has not settled yet, it is still fetched only once across the three periods
+        requests = Counter(self.server.timesheet_requests)
+        self.assertEqual(set(requests), period_days | lookback_days)
+        self.assertEqual(set(requests.values()), {1})
+
+        # The dashboard serves the precomputed summary without fetching the open days again
+        self.server.timesheet_requests.clear()
+        dashboard = AttendanceAnalyzer(api_base=self.api_base, api_key='test', org_id='42')
+        yesterday = periods['Yesterday'][0]
+        summary_df, generated_at = dashboard.load_summary(yesterday, yesterday)
+        self.assertIsNotNone(summary_df)
+        self.assertEqual(self.server.timesheet_requests, [])
+
+        # Once stored open days expire, a report fetches each of them once for hash and analysis
+        dashboard = AttendanceAnalyzer(api_base=self.api_base, api_key='test', org_id='42')
+        dashboard.open_day_ttl = 0
+        dashboard.start_date = dashboard.end_date = yesterday
+        self.assertIsNotNone(dashboard.load_summary(yesterday, yesterday)[0])
+        dashboard.analyze_attendance()
+        self.assertEqual(self.server.timesheet_requests, [yesterday.isoformat()])
+
+    def test_failed_run_is_recorded(self):
+        self.server.fail = True
+        self.analyzer.raise_on_fetch_error = True
+        run = warm_up(self.analyzer, lookback_days=3, today=date(2025, 2, 15))
+
+        self.assertIn('SlingUnavailable', run['error'])
+        with open(os.path.join(self.analyzer.cache_dir, 'warmup_runs.jsonl')) as f:
+            self.assertEqual([json.loads(line) for line in f], [run])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Scheduled cache warm-up for the attendance dashboard.
+
+Runs as its own process next to the dashboard, e.g.
+
+    python warmup.py --at 06:00 --at 13:00
+    python warmup.py --once --api-base http://localhost:8081/v1
+
+Credentials come from SLING_API_BASE / SLING_API_KEY / SLING_ORG_ID in the
+environment, falling back to the Streamlit secrets. Without SLING_ORG_ID every
+configured organization is warmed up concurrently.
+
+Days that have not settled yet are served from the warm-up's fetch for
+Reporting.OPEN_DAY_TTL, so schedule runs at least that often during the hours
+the dashboard is used.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from Reporting import AttendanceAnalyzer, standard_periods
+from sling import get_process_organizations, run_per_org
+
+def warm_up(analyzer, lookback_days=3, today=None):
+    """Refresh the latest days' timesheets and precompute the standard periods
+    
+    A failure is recorded in the run (and the runs log) instead of raised, so one
+    organization or run never stops the schedule.
+    """
+    today = today or datetime.now().date()
+    run = {'started_at': datetime.now().isoformat(timespec='seconds'), 'durations': {}}
+    run_start = time.perf_counter()
+    # Days still open are fetched once per run, not once per period
+    analyzer.fetched_timesheets = {}
+
+    try:
+        # The user directory is cached in this process only; fetching it up front lets
+        # the period runs below share it (the dashboard fetches its own)
+        start = time.perf_counter()
+        user_map = analyzer.fetch_user_data()
+        run['durations']['users'] = round(time.perf_counter() - start, 3)
+
+        # Refetch recent days, timesheets may still be edited after the day ends; days
+        # that have not settled are stored too, so the dashboard reuses this fetch
+        start = time.perf_counter()
+        for offset in range(1, lookback_days + 1):
+            analyzer.fetch_timesheet_data(today - timedelta(days=offset), refresh=True)
+        run['durations']['timesheets'] = round(time.perf_counter() - start, 3)
+
+        if user_map:
+            for name, (start_date, end_date) in standard_periods(today).items():
+                start = time.perf_counter()
+                analyzer.start_date = start_date
+                analyzer.end_date = end_date
+                summary_df = analyzer.analyze_attendance()
+                duration = time.perf_counter() - start
+                analyzer.save_summary(summary_df, start_date, end_date, duration)
+                run['durations'][name] = round(duration, 3)
+    except Exception as e:
+        run['error'] = f"{type(e).__name__}: {e}"
+
+    run['durations']['total'] = round(time.perf_counter() - run_start, 3)
+
+    # Keep a history of run durations next to the cached data
+    try:
+        os.makedirs(analyzer.cache_dir, exist_ok=True)
+        with open(os.path.join(analyzer.cache_dir, 'warmup_runs.jsonl'), 'a') as f:
+            f.write(json.dumps(run) + '\n')
+    except OSError as e:
+        print(f"Could not record warm-up run of {analyzer.org_id}: {e}")
+    return run
+
+def next_run_time(now, run_times):
+    """Next datetime matching one of the daily HH:MM run times"""
+    candidates = []
+    for run_time in run_times:
+        hour, minute = map(int, run_time.split(':'))
+        candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if candidate <= now:
+            candidate += timedelta(days=1)
+        candidates.append(candidate)
+    return min(candidates)
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch Sling data and precompute attendance reports")
+    parser.add_argument('--at', action='append', dest='run_times', metavar='HH:MM',
+                        help="Daily run time (local), may be given several times")
+    parser.add_argument('--every', type=int, metavar='MINUTES', help="Run every N minutes instead")
+    parser.add_argument('--once', action='store_true', help="Run a single warm-up and exit")
+    parser.add_argument('--lookback-days', type=int, default=3,
+                        help="Number of latest days to refetch on every run")
+    parser.add_argument('--api-base', default=os.environ.get('SLING_API_BASE'),
+                        help="Sling API base URL, e.g. a local stub for testing")
+    args = parser.parse_args()
+
+    organizations = get_process_organizations()
+    analyzers = {
+        org['id']: AttendanceAnalyzer(
+            api_base=args.api_base,
+            api_key=org['api_key'],
+            org_id=org['id'],
+            rate_limit=org['rate_limit']
+        )
+        for org in organizations
+    }
+    for analyzer in analyzers.values():
+        # A failed fetch fails the run instead of precomputing summaries from missing data
+        analyzer.raise_on_fetch_error = True
+    run_times = args.run_times or ['06:00']
+
+    while True:
+        try:
+            runs = run_per_org(lambda org: warm_up(analyzers[org['id']], args.lookback_days), organizations)
+            for org, run in zip(organizations, runs):
+                if 'error' in run:
+                    print(f"Warm-up of {org['id']} failed at {datetime.now():%Y-%m-%d %H:%M:%S}: {run['error']}")
+                else:
+                    print(f"Warm-up of {org['id']} finished at {datetime.now():%Y-%m-%d %H:%M:%S}: {run['durations']}")
+        except Exception as e:
+            print(f"Warm-up run failed at {datetime.now():%Y-%m-%d %H:%M:%S}: {e}")
+        if args.once:
+            return
+
+        if args.every:
+            time.sleep(args.every * 60)
+        else:
+            wake_at = next_run_time(datetime.now(), run_times)
+            time.sleep((wake_at - datetime.now()).total_seconds())
+
+if __name__ == "__main__":
+    main()